@@ -344,7 +344,7 @@ class CodeRunner:
         # heuristic
         settings = self._profile.settings
         if settings.startup_mode is not None:
-            if settings.startup_mode in self._profile.modes.mode_names():
+            if settings.startup_mode in self._profile.modes.mode_name_set():
                 start_mode = settings.startup_mode
 
         # Set default macro action delay
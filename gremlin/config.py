@@ -11,7 +11,7 @@ import os
 import re
 import uuid
 
-from typing import Any, Tuple
+from typing import Any, Iterable, Tuple
 
 from gremlin import common, error, util
 from gremlin.types import PropertyType
@@ -153,6 +153,53 @@ class Configuration(metaclass=common.SingletonMetaclass):
             properties: dictionary of relevant properties
             expose: if True expose the parameter via the UI to the user
         """
+        self._register_entry(
+            section, group, name, data_type, initial_value, description,
+            properties, expose
+        )
+        try:
+            self.save()
+        except TypeError as e:
+            key = (section, group, name)
+            print(key, self._data[key])
+            print(e)
+
+    def register_many(
+        self,
+        entries: Iterable[tuple[Any, ...]]
+    ) -> None:
+        """Registers multiple configuration parameters at once.
+
+        The configuration file is written only once after all parameters
+        have been registered.
+
+        Args:
+            entries: argument tuples as accepted by register
+        """
+        for entry in entries:
+            self._register_entry(*entry)
+        try:
+            self.save()
+        except TypeError as e:
+            logging.getLogger("system").error(
+                f"Failed to save the configuration: {e}"
+            )
+
+    def _register_entry(
+        self,
+        section: str,
+        group: str,
+        name: str,
+        data_type: PropertyType,
+        initial_value: Any,
+        description: str,
+        properties: dict[str, Any],
+        expose: bool=False
+    ) -> None:
+        """Adds or updates a parameter's entry without writing the file.
+
+        See register for a description of the arguments.
+        """
         self._validate(section, group, name)
         key = (section, group, name)
 
@@ -203,12 +250,6 @@ class Configuration(metaclass=common.SingletonMetaclass):
                 "expose": expose
             }
 
-        try:
-            self.save()
-        except TypeError as e:
-            print(key, self._data[key])
-            print(e)
-
         # Mark property as being registered
         self._data[key]["is_registered"] = True
 
@@ -147,7 +147,11 @@ class Event:
 
     def __eq__(self, other: object) -> bool:
         assert isinstance(other, Event)
-        return self.__hash__() == other.__hash__()
+        # Compare the fields making up the hash directly, which avoids
+        # hashing both events on every callback lookup
+        return self.identifier == other.identifier \
+            and self.event_type is other.event_type \
+            and self.device_guid == other.device_guid
 
     def __ne__(self, other: object) -> bool:
         assert isinstance(other, Event)
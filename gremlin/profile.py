@@ -1029,6 +1029,7 @@ class ModeHierarchy:
         self._profile = parent_profile
         self._hierarchy = TreeNode("")
         self._hierarchy.add_child(TreeNode("Default"))
+        self._mode_name_set: frozenset[str] | None = None
 
     @property
     def first_mode(self) -> str:
@@ -1045,7 +1046,22 @@ class ModeHierarchy:
         Returns:
             List of all mode names
         """
-        return sorted([node.value for node in self.mode_list()])
+        return sorted(self.mode_name_set())
+
+    def mode_name_set(self) -> frozenset[str]:
+        """Returns the set of all mode names.
+
+        The set is cached until the hierarchy is modified, making it suitable
+        for repeated membership tests.
+
+        Returns:
+            Set of all mode names
+        """
+        if self._mode_name_set is None:
+            self._mode_name_set = frozenset(
+                node.value for node in self.mode_list()
+            )
+        return self._mode_name_set
 
     def mode_list(self) -> List[TreeNode]:
         """Returns a list of all mode nodes.
@@ -1104,6 +1120,7 @@ class ModeHierarchy:
                 f"Attempting to add an already existing mode '{mode_name}'."
             )
         self._hierarchy.add_child(TreeNode(mode_name))
+        self._mode_name_set = None
 
     def delete_mode(self, mode_name: str) -> None:
         """Deletes the mode with the given name from the hierarchy.
@@ -1123,6 +1140,7 @@ class ModeHierarchy:
         node.detach()
         for child in node.children:
             child.set_parent(parent_node)
+        self._mode_name_set = None
 
         # Find all InputItem actions using the mode being deleted and remove
         # them as well.
@@ -1157,6 +1175,7 @@ class ModeHierarchy:
         # Perform renaming of the mode
         node = self.find_mode(old_name)
         node.value = new_name
+        self._mode_name_set = None
 
         # Find all actions associated to the old mode name
         for action in self._actions_with_mode(old_name):
@@ -1203,6 +1222,7 @@ class ModeHierarchy:
         for node in nodes.values():
             if node.parent is None:
                 node.set_parent(self._hierarchy)
+        self._mode_name_set = None
 
     def to_xml(self) -> ElementTree.Element:
         node = ElementTree.Element("modes")
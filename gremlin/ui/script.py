@@ -385,6 +385,7 @@ class VirtualInputVariableModel(AbstractVariableModel):
         input_type = InputType.to_enum(value)
         if self._variable.input_type != input_type:
             self._variable._input_type = input_type
+            self._variable._invalidate_apply()
             self.changed.emit()
             self.evaluate_validity()
 
@@ -394,6 +395,7 @@ class VirtualInputVariableModel(AbstractVariableModel):
     def _set_input_id(self, index: int) -> None:
         if self._variable.input_id != index:
             self._variable._input_id = index
+            self._variable._invalidate_apply()
             self.changed.emit()
             self.evaluate_validity()
 
@@ -403,6 +405,7 @@ class VirtualInputVariableModel(AbstractVariableModel):
     def _set_vjoy_id(self, index: int) -> None:
         if self._variable.vjoy_id != index:
             self._variable._vjoy_id = index
+            self._variable._invalidate_apply()
             self.changed.emit()
             self.evaluate_validity()
 
@@ -5,16 +5,17 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import copy
+from collections import defaultdict
 import functools
 import heapq
-import importlib
+import importlib.util
 import inspect
 import logging
-import numbers
+import os
 from pathlib import Path
-import random
-import string
+import secrets
+import stat
+import sys
 import threading
 import time
 from typing import (
@@ -24,6 +25,7 @@ from typing import (
     List,
 )
 import uuid
+import weakref
 from xml.etree import ElementTree
 
 import dill
@@ -55,13 +57,65 @@ def _resolve_path(script_path: Path) -> Path:
     return Path(util.resource_path("user_scripts")) / script_path
 
 
+def _regular_file_stat(path: Path) -> os.stat_result | None:
+    """Returns the status of the given path if it is a regular file.
+
+    Args:
+        path: path of the file to check
+
+    Returns:
+        Status of the file, None if the path is not a regular file
+    """
+    try:
+        file_stat = path.stat()
+    except OSError:
+        return None
+    return file_stat if stat.S_ISREG(file_stat.st_mode) else None
+
+
+# Identifier of the script whose module is currently being executed by
+# the calling thread
+_active_script = threading.local()
+
+# Variable definitions of executed scripts, holding the script's default
+# values, keyed by the script's path and storing the file's modification time
+# alongside the variables
+_definition_cache: dict[Path, tuple[int, tuple[AbstractVariable, ...]]] = {}
+
+
+# Parameter names of callbacks, held weakly so that the callbacks of reloaded
+# scripts, and with them the script modules, can be garbage collected
+_parameter_name_cache: weakref.WeakKeyDictionary[Callable, frozenset[str]] = \
+    weakref.WeakKeyDictionary()
+
+
+def _parameter_names(callback: Callable) -> frozenset[str]:
+    """Returns the names of the parameters accepted by a callback.
+
+    Args:
+        callback: the function whose parameters to return
+
+    Returns:
+        Set of the callback's parameter names
+    """
+    try:
+        names = _parameter_name_cache.get(callback)
+    except TypeError:
+        # Callables which cannot be weakly referenced are not cached
+        return frozenset(inspect.signature(callback).parameters)
+    if names is None:
+        names = frozenset(inspect.signature(callback).parameters)
+        _parameter_name_cache[callback] = names
+    return names
+
+
 class CallbackRegistry:
 
     """Registry of all callbacks known to the system."""
 
     def __init__(self):
         """Creates a new callback registry instance."""
-        self._registry = {}
+        self._registry = self._create_registry()
         self._current_id = 0
 
     def add(
@@ -78,15 +132,9 @@ class CallbackRegistry:
             mode: the mode in which to trigger the callback
         """
         self._current_id += 1
-        function_name = "{}_{:d}".format(callback.__name__, self._current_id)
-
-        if event.device_guid not in self._registry:
-            self._registry[event.device_guid] = {}
-        if mode not in self._registry[event.device_guid]:
-            self._registry[event.device_guid][mode] = {}
-        if event not in self._registry[event.device_guid][mode]:
-            self._registry[event.device_guid][mode][event] = {}
-
+        function_name = "{}_{:d}".format(
+            getattr(callback, "__name__", repr(callback)), self._current_id
+        )
         self._registry[event.device_guid][mode][event][function_name] = callback
 
     @property
@@ -100,7 +148,16 @@ class CallbackRegistry:
 
     def clear(self) -> None:
         """Clears the registry entries."""
-        self._registry = {}
+        self._registry = self._create_registry()
+
+    @staticmethod
+    def _create_registry() -> defaultdict:
+        """Returns an empty registry creating intermediate levels on demand.
+
+        Returns:
+            Nested dictionary keyed by device guid, mode, and event
+        """
+        return defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
 
 
 class PeriodicRegistry:
@@ -109,8 +166,9 @@ class PeriodicRegistry:
 
     def __init__(self):
         """Creates a new instance."""
-        self._registry = {}
+        self._registry = []
         self._running = False
+        self._stop_event = threading.Event()
         self._thread = threading.Thread(target=self._thread_loop)
         self._queue = []
         self._plugins = []
@@ -125,12 +183,14 @@ class PeriodicRegistry:
         # currently running
         self._running = True
         if not self._thread.is_alive():
+            self._stop_event.clear()
             self._thread = threading.Thread(target=self._thread_loop)
             self._thread.start()
 
     def stop(self) -> None:
         """Stops the event loop."""
         self._running = False
+        self._stop_event.set()
         if self._thread.is_alive():
             self._thread.join()
 
@@ -141,11 +201,13 @@ class PeriodicRegistry:
             callback: the function to execute
             interval: the time in seconds between executions
         """
-        self._registry[callback] = (interval, callback)
+        # Each registration is kept as its own entry, even for a callback
+        # that has already been added
+        self._registry.append((interval, callback))
 
     def clear(self) -> None:
         """Clears the registry."""
-        self._registry = {}
+        self._registry = []
 
     def _install_plugins(self, callback: Callable) -> Callable:
         """Installs the current plugins into the given callback.
@@ -156,50 +218,69 @@ class PeriodicRegistry:
         Returns:
             new callback with plugins installed
         """
-        signature = inspect.signature(callback).parameters
+        parameters = _parameter_names(callback)
         partial_fn = functools.partial
-        if "self" in signature:
+        if "self" in parameters:
             partial_fn = functools.partialmethod
         for plugin in self._plugins:
-            if plugin.keyword in signature:
+            if plugin.keyword in parameters:
                 callback = plugin.install(callback, partial_fn)
         return callback
 
     def _thread_loop(self) -> None:
         """Main execution loop run in a separate thread."""
-        # Setup plugins to use
-        self._plugins = [
-            JoystickPlugin(),
-            VJoyPlugin(),
-            KeyboardPlugin()
+        # Setup plugins to use, these are reused across restarts
+        if not self._plugins:
+            self._plugins = [
+                JoystickPlugin(),
+                VJoyPlugin(),
+                KeyboardPlugin()
+            ]
+        # Populate the queue, using a monotonic clock so that scheduling is
+        # unaffected by changes to the system time. Callbacks sharing an
+        # interval are grouped into a single queue entry, bounding the queue
+        # size by the number of distinct intervals rather than callbacks.
+        monotonic = time.monotonic
+        now = monotonic()
+        interval_map = {}
+        for interval, callback in self._registry:
+            interval_map.setdefault(interval, []).append(
+                self._install_plugins(callback)
+            )
+        # Entries carry their callbacks directly, as intervals are unique
+        # the tuple comparison never has to look at the callbacks
+        self._queue = [
+            (now + interval, interval, tuple(callbacks))
+            for interval, callbacks in interval_map.items()
         ]
-        callback_map = {}
+        heapq.heapify(self._queue)
 
-        # Populate the queue
-        self._queue = []
-        for item in self._registry.values():
-            plugin_cb = self._install_plugins(item[1])
-            callback_map[plugin_cb] = item[0]
-            heapq.heappush(
-                self._queue,
-                (time.time() + callback_map[plugin_cb], plugin_cb)
-            )
+        # The registry may have been cleared before the thread got to run,
+        # in which case there is nothing to do until asked to stop
+        if not self._queue:
+            self._stop_event.wait()
+            return
 
-        # Main thread loop
+        # Main thread loop, with frequently used functions bound locally
+        queue = self._queue
+        heapreplace = heapq.heapreplace
+        wait = self._stop_event.wait
         while self._running:
             # Process all events that require running
-            while self._queue[0][0] < time.time():
-                item = heapq.heappop(self._queue)
-                item[1]()
-
-                heapq.heappush(
-                    self._queue,
-                    (time.time() + callback_map[item[1]], item[1])
-                )
-
-            # Sleep until either the next function needs to be run or
-            # our timeout expires
-            time.sleep(min(self._queue[0][0] - time.time(), 1.0))
+            now = monotonic()
+            while queue[0][0] < now:
+                # Reschedule the entry in place, requiring a single sift
+                # of the heap instead of a pop followed by a push
+                _, interval, callbacks = queue[0]
+                heapreplace(queue, (now + interval, interval, callbacks))
+                for callback in callbacks:
+                    callback()
+
+            # Sleep until either the next function needs to be run, our
+            # timeout expires, or the loop is asked to stop
+            delay = max(0.0, queue[0][0] - now)
+            if wait(min(delay, 1.0)):
+                return
 
 
 callback_registry = CallbackRegistry()
@@ -226,29 +307,39 @@ class JoystickDecorator:
             self.device_guid = uuid.UUID(device_guid)
         except ValueError:
             logging.getLogger("system").error(
-                f"Invalid guid value '{device_guid}' received."
+                "Invalid guid value '%s' received.", device_guid
             )
-            self.device_guid = diill.UUID_Invalid
+            self.device_guid = dill.UUID_Invalid
 
         # Create decorators for the different input types
-        self.axis = functools.partial(
-            _input_callback,
-            device_guid=self.device_guid,
-            input_type=InputType.JoystickAxis,
-            mode=self.mode
-        )
-        self.button = functools.partial(
-            _input_callback,
-            device_guid=self.device_guid,
-            input_type=InputType.JoystickButton,
-            mode=self.mode
-        )
-        self.hat = functools.partial(
-            _input_callback,
-            device_guid=self.device_guid,
-            input_type=InputType.JoystickHat,
-            mode=self.mode
-        )
+        self.axis = self._create_decorator(InputType.JoystickAxis)
+        self.button = self._create_decorator(InputType.JoystickButton)
+        self.hat = self._create_decorator(InputType.JoystickHat)
+
+    def _create_decorator(self, input_type: InputType) -> Callable:
+        """Returns a decorator factory for inputs of the given type.
+
+        Args:
+            input_type: type of the inputs the decorators are created for
+
+        Returns:
+            Function creating the decorator for a specific input id
+        """
+        device_guid = self.device_guid
+        mode = self.mode
+
+        def create(input_id: int) -> Callable:
+            return _input_callback(input_id, device_guid, input_type, mode)
+
+        return create
+
+
+# Maps each joystick input type to the creation of its decorator
+_joystick_decorators = {
+    InputType.JoystickAxis: lambda dec, input_id: dec.axis(input_id),
+    InputType.JoystickButton: lambda dec, input_id: dec.button(input_id),
+    InputType.JoystickHat: lambda dec, input_id: dec.hat(input_id),
+}
 
 
 class VJoyPlugin:
@@ -259,8 +350,6 @@ class VJoyPlugin:
     to be named "vjoy".
     """
 
-    vjoy = VJoyProxy()
-
     def __init__(self):
         self.keyword = "vjoy"
 
@@ -278,7 +367,7 @@ class VJoyPlugin:
         Returns:
             callback with the plugin parameter bound
         """
-        return partial_fn(callback, vjoy=VJoyPlugin.vjoy)
+        return partial_fn(callback, vjoy=VJoyProxy())
 
 
 class JoystickPlugin:
@@ -289,8 +378,6 @@ class JoystickPlugin:
     to be named "joy".
     """
 
-    joystick = Joystick()
-
     def __init__(self):
         self.keyword = "joy"
 
@@ -308,7 +395,7 @@ class JoystickPlugin:
         Returns:
             callback with the plugin parameter bound
         """
-        return partial_fn(callback, joy=JoystickPlugin.joystick)
+        return partial_fn(callback, joy=Joystick())
 
 
 class KeyboardPlugin:
@@ -319,8 +406,6 @@ class KeyboardPlugin:
     to be named "keyboard".
     """
 
-    keyboard = Keyboard()
-
     def __init__(self):
         self.keyword = "keyboard"
 
@@ -335,7 +420,7 @@ class KeyboardPlugin:
         Returns:
             callback with the plugin parameter bound
         """
-        return partial_fn(callback, keyboard=KeyboardPlugin.keyboard)
+        return partial_fn(callback, keyboard=Keyboard())
 
 
 class ScriptVariableRegistry:
@@ -359,6 +444,17 @@ class ScriptVariableRegistry:
         for variable in script.variables.values():
             self._registry[script.id][variable.name] = variable
 
+    def has_script(self, script_id: uuid.UUID) -> bool:
+        """Returns whether variables are stored for the given script.
+
+        Args:
+            script_id: unique identifier of the script
+
+        Returns:
+            True if variables of the script are stored, False otherwise
+        """
+        return script_id in self._registry
+
     def remove_script(self, script: Script) -> None:
         """Removes the specified script's variables.
 
@@ -406,9 +502,11 @@ class Script:
         self.path = _resolve_path(path)
         self.name = name
         self.variables: dict[str, AbstractVariable] = {}
+        self._required_variables: tuple[AbstractVariable, ...] = ()
 
-        if self.path.is_file():
-            self._retrieve_variable_definitions()
+        file_stat = _regular_file_stat(self.path)
+        if file_stat is not None:
+            self._retrieve_variable_definitions(file_stat)
             self.variable_registry.register_script(self)
 
     @property
@@ -427,9 +525,7 @@ class Script:
         Returns:
             True if the instance is fully configured, False otherwise
         """
-        return all([
-            var.is_valid() for var in self.variables.values() if not var.is_optional
-        ])
+        return all(var.is_valid() for var in self._required_variables)
 
     def has_variable(self, name: str) -> bool:
         """Returns if this instance has a particular variable.
@@ -450,6 +546,7 @@ class Script:
             variable: Variable to store
         """
         self.variables[name] = variable
+        self._update_required_variables()
 
     def get_variable(self, name: str) -> AbstractVariable:
         """Returns the variable stored under the specified name.
@@ -477,43 +574,48 @@ class Script:
         # Remove information of this script in case the ID changes
         Script.variable_registry.remove_script(self)
 
-        lookup = {
-            "bool": BoolVariable,
-            "float": FloatVariable,
-            "int": IntegerVariable,
-            "keyboard": KeyboardVariable,
-            "logical-device": LogicalDeviceVariable,
-            "mode": ModeVariable,
-            "physical-input": PhysicalInputVariable,
-            "selection": SelectionVariable,
-            "string": StringVariable,
-            "vjoy": VirtualInputVariable,
-        }
-
         self._id = util.read_uuid(node, "script", "id")
-        self.path = _resolve_path(util.read_property(node, "path", PropertyType.Path))
-        self.name = util.read_property(node, "name", PropertyType.String)
+        properties = util.read_properties_bulk(
+            node,
+            [
+                ("path", PropertyType.Path),
+                ("name", PropertyType.String),
+            ]
+        )
+        self.path = _resolve_path(properties["path"])
+        self.name = properties["name"]
 
         # Retrieve variable information from the script and instantiate them
         self._retrieve_variable_definitions()
 
         # Populate variables with data from the XML if they are present
-        for entry in node.iter("variable"):
-            name = util.read_property(entry, "name", PropertyType.String)
+        for entry in node.iterfind("variable"):
+            # Interning lets the lookups below match the definition's name,
+            # typically a literal in the script, by identity
+            name = sys.intern(
+                util.read_property(entry, "name", PropertyType.String)
+            )
             # Don't parse variables that don't exist anymore, they will be
             # removed upon the next save
             if name not in self.variables:
                 logging.getLogger("system").warning(
-                    f"Script: Unknown variable '{name}' ignored"
+                    "Script: Unknown variable '%s' ignored", name
                 )
                 continue
             type_name = entry.get("type")
-            if not isinstance(self.variables[name], lookup[type_name]):
+            variable_type = _variable_types.get(type_name)
+            if variable_type is None:
                 raise error.GremlinError(
-                    f"Script: Type mismatch, profile contains '{type_name}' " + \
-                    f"while script expects '{self.variables[name]}'"
+                    f"Script: Unknown variable type '{type_name}'"
                 )
-            self.variables[name].from_xml(entry)
+            if not isinstance(self.variables[name], variable_type):
+                raise error.GremlinError(
+                    f"Script: Type mismatch, profile contains '{type_name}' "
+                    f"while script expects '{self.variables[name].xml_tag}'"
+                )
+            # The variable is stored under the name just read, so only its
+            # value needs parsing rather than reading the name once more
+            self.variables[name]._from_xml(entry)
 
         # Store script values in the registry
         Script.variable_registry.register_script(self)
@@ -546,37 +648,95 @@ class Script:
         and then reload all scripts.
         """
         Script.variable_registry.register_script(self)
+        self._execute_module()
+
+    def _execute_module(self) -> None:
+        """Executes the script's module with this script marked as active.
+
+        Variables created while the module executes use the active script's
+        identifier to retrieve their values from the variable registry.
+        """
         self.module._script_id = self.id
-        self.spec.loader.exec_module(self.module)
+        previous_id = getattr(_active_script, "id", None)
+        _active_script.id = self.id
+        try:
+            self.spec.loader.exec_module(self.module)
+        finally:
+            _active_script.id = previous_id
 
-    def _retrieve_variable_definitions(self):
-        """Returns all variable definitions used in the provided script.
+    def _retrieve_variable_definitions(
+            self,
+            file_stat: os.stat_result | None = None
+    ) -> None:
+        """Populates the variables with the definitions of the script file.
 
         Args:
-            path: Path to the script file
-
-        Returns:
-            List of variiables used in the script
+            file_stat: status of the script file if already retrieved
         """
         self.variables = {}
-        if not self.path.is_file():
+        if file_stat is None:
+            file_stat = _regular_file_stat(self.path)
+        if file_stat is None:
             raise error.GremlinError(f"Invalid script file '{self.path}'")
 
         self.spec = importlib.util.spec_from_file_location(
-            "".join(random.choices(string.ascii_lowercase, k=16)),
+            f"gremlin_script_{secrets.token_hex(8)}",
             str(self.path)
         )
         self.module = importlib.util.module_from_spec(self.spec)
-        self.module._script_id = self.id
-        self.spec.loader.exec_module(self.module)
 
-        for key, value in self.module.__dict__.items():
+        # Reuse the definitions of an unchanged script rather than executing
+        # it again. Module level side effects of the script, such as callbacks
+        # registered by decorators, thus do not occur on a cache hit. The
+        # module itself is executed again once the script runs.
+        mtime = file_stat.st_mtime_ns
+        cached = _definition_cache.get(self.path)
+        if cached is not None and cached[0] == mtime:
+            for var in cached[1]:
+                var = var.clone()
+                var._initialize_from_registry(self.id)
+                self.variables[var.name] = var
+        else:
+            # Definitions only hold the script's defaults, and can be shared
+            # with other instances, if no values are registered for this script
+            has_defaults = not Script.variable_registry.has_script(self.id)
+            definitions = self._execute_definitions()
+            for var in definitions:
+                self.variables[var.name] = var.clone()
+            if has_defaults and \
+                    not any(var.depends_on_profile for var in definitions):
+                _definition_cache[self.path] = (
+                    mtime, tuple(var.clone() for var in definitions)
+                )
+        self._update_required_variables()
+
+    def _execute_definitions(self) -> list[AbstractVariable]:
+        """Executes the script's module and returns the variables it defines.
+
+        Returns:
+            Variables defined by the script, in order of definition
+        """
+        self._execute_module()
+
+        definitions = []
+        names = set()
+        for value in self.module.__dict__.values():
             if isinstance(value, AbstractVariable):
-                if value.name in self.variables:
+                if value.name in names:
                     logging.getLogger("system").error(
-                        f"Script: Duplicate label {value.label} present in {path}"
+                        "Script: Duplicate variable '%s' present in %s",
+                        value.name,
+                        self.path
                     )
-                self.variables[value.name] = copy.deepcopy(value)
+                names.add(value.name)
+                definitions.append(value)
+        return definitions
+
+    def _update_required_variables(self) -> None:
+        """Caches the variables which have to be valid for the script to run."""
+        self._required_variables = tuple(
+            var for var in self.variables.values() if not var.is_optional
+        )
 
     def swap_uuid(self, old_uuid: uuid.UUID, new_uuid: uuid.UUID) -> bool:
         """Swaps occurrences of the old UUID with the new one for this action."""
@@ -589,7 +749,12 @@ class Script:
 
 class AbstractVariable(ABC):
 
+    __slots__ = ("name", "description", "is_optional", "is_set")
+
     xml_tag = "abstract"
+    # Whether the variable's initial state depends on the current profile,
+    # preventing the reuse of its definition across profile loads
+    depends_on_profile = False
 
     def __init__(
             self,
@@ -612,6 +777,21 @@ class AbstractVariable(ABC):
     def value(self, value: Any) -> None:
         pass
 
+    def clone(self) -> AbstractVariable:
+        """Returns a copy of this variable.
+
+        Variables only reference immutable values or containers which are
+        never modified in place, so copying the slot contents suffices.
+
+        Returns:
+            New variable instance holding the same values
+        """
+        clone = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                setattr(clone, name, getattr(self, name))
+        return clone
+
     def from_xml(self, node: ElementTree.Element) -> None:
         self.name = util.read_property(node, "name", PropertyType.String)
         self._from_xml(node)
@@ -619,14 +799,8 @@ class AbstractVariable(ABC):
     def to_xml(self) -> ElementTree.Element:
         if not self.is_valid():
             return None
-        node = ElementTree.Element("variable")
-        node.set("type", self.xml_tag)
-        util.append_property_nodes(
-            node,
-            [
-                ["name", self.name, PropertyType.String]
-            ]
-        )
+        node = ElementTree.Element("variable", {"type": self.xml_tag})
+        util.add_property_node(node, "name", self.name, PropertyType.String)
         self._to_xml(node)
         return node
 
@@ -647,17 +821,19 @@ class AbstractVariable(ABC):
         pass
 
     def _get_script_id(self) -> uuid.UUID|None:
-        for frame in inspect.stack():
-            identifier = frame.frame.f_locals.get(
-                "_script_id",
-                None
-            )
-            if isinstance(identifier, uuid.UUID):
-                return identifier
-        return None
+        return getattr(_active_script, "id", None)
+
+    def _initialize_from_registry(
+            self,
+            script_id: uuid.UUID | None = None
+    ) -> None:
+        """Assigns the value stored in the registry for this variable.
 
-    def _initialize_from_registry(self) -> None:
-        idx = self._get_script_id()
+        Args:
+            script_id: script whose value to use, defaults to the script
+                currently being executed
+        """
+        idx = self._get_script_id() if script_id is None else script_id
         var = Script.variable_registry.get(idx, self.name)
         if isinstance(var, AbstractVariable):
             self._assign_value_from(var)
@@ -669,6 +845,8 @@ class AbstractVariable(ABC):
 
 class BoolVariable(AbstractVariable):
 
+    __slots__ = ("_value",)
+
     xml_tag = "bool"
 
     def __init__(
@@ -692,15 +870,15 @@ class BoolVariable(AbstractVariable):
         self._value = value
 
     def is_valid(self) -> bool:
-        return self._value in [True, False]
+        return isinstance(self._value, bool)
 
     def _from_xml(self, node: ElementTree.Element) -> None:
         self._value = util.read_property(node, "value", PropertyType.Bool)
 
     def _to_xml(self, node: ElementTree.Element) -> None:
-        node.append(util.create_property_node(
-            "value", self.value, PropertyType.Bool
-        ))
+        util.add_property_node(
+            node, "value", self.value, PropertyType.Bool
+        )
 
     def _assign_value_from(self, other: BoolVariable) -> None:
         self._value = other.value
@@ -708,6 +886,8 @@ class BoolVariable(AbstractVariable):
 
 class FloatVariable(AbstractVariable):
 
+    __slots__ = ("_value", "_min_value", "_max_value")
+
     xml_tag = "float"
 
     def __init__(
@@ -722,8 +902,9 @@ class FloatVariable(AbstractVariable):
         super().__init__(name, description, is_optional)
 
         self._value = initial_value
-        self._min_value = min_value
-        self._max_value = max_value
+        # Order the bounds once so that setting values needs no swap check
+        self._min_value = min(min_value, max_value)
+        self._max_value = max(min_value, max_value)
         self._initialize_from_registry()
 
     @property
@@ -732,7 +913,8 @@ class FloatVariable(AbstractVariable):
 
     @value.setter
     def value(self, value: float) -> None:
-        self._value = clamp_value(value, self._min_value, self._max_value)
+        self._value = self._min_value if value < self._min_value else \
+            self._max_value if value > self._max_value else value
 
     @property
     def min_value(self) -> float:
@@ -743,7 +925,7 @@ class FloatVariable(AbstractVariable):
         return self._max_value
 
     def is_valid(self) -> bool:
-        return isinstance(self._value, numbers.Number)
+        return isinstance(self._value, (int, float))
 
     def _from_xml(self, node: ElementTree.Element) -> None:
         self._value = util.read_property(
@@ -751,10 +933,8 @@ class FloatVariable(AbstractVariable):
         )
 
     def _to_xml(self, node: ElementTree.Element) -> None:
-        node.append(
-            util.create_property_node(
-                "value", self._value, [PropertyType.Float, PropertyType.Int]
-            )
+        util.add_property_node(
+            node, "value", self._value, [PropertyType.Float, PropertyType.Int]
         )
 
     def _assign_value_from(self, other: FloatVariable) -> None:
@@ -763,6 +943,8 @@ class FloatVariable(AbstractVariable):
 
 class IntegerVariable(AbstractVariable):
 
+    __slots__ = ("_value", "_min_value", "_max_value")
+
     xml_tag = "int"
 
     def __init__(
@@ -777,8 +959,9 @@ class IntegerVariable(AbstractVariable):
         super().__init__(name, description, is_optional)
 
         self._value = initial_value
-        self._min_value = min_value
-        self._max_value = max_value
+        # Order the bounds once so that setting values needs no swap check
+        self._min_value = min(min_value, max_value)
+        self._max_value = max(min_value, max_value)
         self._initialize_from_registry()
 
     @property
@@ -787,7 +970,8 @@ class IntegerVariable(AbstractVariable):
 
     @value.setter
     def value(self, value: int) -> None:
-        self._value = clamp_value(value, self._min_value, self._max_value)
+        self._value = self._min_value if value < self._min_value else \
+            self._max_value if value > self._max_value else value
 
     @property
     def min_value(self) -> int:
@@ -804,9 +988,9 @@ class IntegerVariable(AbstractVariable):
         self._value = util.read_property(node, "value", PropertyType.Int)
 
     def _to_xml(self, node: ElementTree.Element) -> None:
-        node.append(util.create_property_node(
-            "value", self._value, PropertyType.Int
-        ))
+        util.add_property_node(
+            node, "value", self._value, PropertyType.Int
+        )
 
     def _assign_value_from(self, other: IntegerVariable) -> None:
         self._value = other.value
@@ -814,6 +998,8 @@ class IntegerVariable(AbstractVariable):
 
 class KeyboardVariable(AbstractVariable):
 
+    __slots__ = ("_value",)
+
     xml_tag = "keyboard"
 
     def __init__(
@@ -838,19 +1024,24 @@ class KeyboardVariable(AbstractVariable):
     def is_valid(self) -> bool:
         return isinstance(self._value, gremlin.keyboard.Key)
     def _from_xml(self, node: ElementTree.Element) -> None:
+        properties = util.read_properties_bulk(
+            node,
+            [
+                ("scan-code", PropertyType.Int),
+                ("is-extended", PropertyType.Bool),
+            ]
+        )
         self._value = gremlin.keyboard.key_from_code(
-            util.read_property(node, "scan-code", PropertyType.Int),
-            util.read_property(node, "is-extended", PropertyType.Bool)
+            properties["scan-code"], properties["is-extended"]
         )
 
     def _to_xml(self, node: ElementTree.Element) -> None:
         assert isinstance(self._value, gremlin.keyboard.Key)
-        util.append_property_nodes(
-            node,
-            [
-                ["scan-code", self._value.scan_code, PropertyType.Int],
-                ["is-extended", self._value.is_extended, PropertyType.Bool],
-            ]
+        util.add_property_node(
+            node, "scan-code", self._value.scan_code, PropertyType.Int
+        )
+        util.add_property_node(
+            node, "is-extended", self._value.is_extended, PropertyType.Bool
         )
 
     def _assign_value_from(self, other: KeyboardVariable) -> None:
@@ -867,7 +1058,10 @@ class KeyboardVariable(AbstractVariable):
 
 class LogicalDeviceVariable(AbstractVariable):
 
+    __slots__ = ("_ld", "_valid_types", "_identifier")
+
     xml_tag = "logical-device"
+    depends_on_profile = True
 
     def __init__(
             self,
@@ -889,17 +1083,12 @@ class LogicalDeviceVariable(AbstractVariable):
 
     def decorator(self, mode: ModeVariable) -> Callable:
         dec = self.create_decorator(mode.value)
-        match self._identifier.type:
-            case InputType.JoystickButton:
-                return dec.button(self._identifier.id)
-            case InputType.JoystickAxis:
-                return dec.axis(self._identifier.id)
-            case InputType.JoystickHat:
-                return dec.hat(self._identifier.id)
-            case _:
-                raise error.GremlinError(
-                    f"Received invalid input type '{self._identifier.type}'"
-                )
+        create_fn = _joystick_decorators.get(self._identifier.type)
+        if create_fn is None:
+            raise error.GremlinError(
+                f"Received invalid input type '{self._identifier.type}'"
+            )
+        return create_fn(dec, self._identifier.id)
 
     def create_decorator(self, mode: str):
         if not self.is_valid():
@@ -929,20 +1118,24 @@ class LogicalDeviceVariable(AbstractVariable):
         return self._ld.exists(self._identifier)
 
     def _from_xml(self, node: ElementTree.Element) -> None:
-        input_type = util.read_property(
-            node, "input-type", PropertyType.InputType
-        )
-        input_id = util.read_property(node, "input-id", PropertyType.Int)
-        self._identifier = LogicalDevice.Input.Identifier(input_type, input_id)
-
-    def _to_xml(self, node: ElementTree.Element) -> None:
-        util.append_property_nodes(
+        properties = util.read_properties_bulk(
             node,
             [
-                ["input-type", self._identifier.type, PropertyType.InputType],
-                ["input-id", self._identifier.id, PropertyType.Int],
+                ("input-type", PropertyType.InputType),
+                ("input-id", PropertyType.Int),
             ]
         )
+        self._identifier = LogicalDevice.Input.Identifier(
+            properties["input-type"], properties["input-id"]
+        )
+
+    def _to_xml(self, node: ElementTree.Element) -> None:
+        util.add_property_node(
+            node, "input-type", self._identifier.type, PropertyType.InputType
+        )
+        util.add_property_node(
+            node, "input-id", self._identifier.id, PropertyType.Int
+        )
 
     def _assign_value_from(self, other: LogicalDeviceVariable) -> None:
         self._identifier = other._identifier
@@ -950,7 +1143,10 @@ class LogicalDeviceVariable(AbstractVariable):
 
 class ModeVariable(AbstractVariable):
 
+    __slots__ = ("_mode",)
+
     xml_tag = "mode"
+    depends_on_profile = True
 
     def __init__(
             self,
@@ -972,15 +1168,15 @@ class ModeVariable(AbstractVariable):
         self._mode = value
 
     def is_valid(self) -> bool:
-        return self._mode in shared_state.current_profile.modes.mode_names()
+        return self._mode in shared_state.current_profile.modes.mode_name_set()
 
     def _from_xml(self, node: ElementTree.Element) -> None:
         self._mode = util.read_property(node, "value", PropertyType.String)
 
     def _to_xml(self, node: ElementTree.Element) -> None:
-        node.append(util.create_property_node(
-            "value", self._mode, PropertyType.String
-        ))
+        util.add_property_node(
+            node, "value", self._mode, PropertyType.String
+        )
 
     def _assign_value_from(self, other: ModeVariable) -> None:
         self._mode = other.value
@@ -988,6 +1184,8 @@ class ModeVariable(AbstractVariable):
 
 class SelectionVariable(AbstractVariable):
 
+    __slots__ = ("_option_list", "_option_index", "_current_index")
+
     xml_tag = "selection"
 
     def __init__(
@@ -1001,6 +1199,10 @@ class SelectionVariable(AbstractVariable):
         super().__init__(name, description, is_optional)
 
         self._option_list = option_list
+        # Iterate in reverse so duplicate options resolve to their first index
+        self._option_index = {
+            opt: i for i, opt in reversed(list(enumerate(option_list)))
+        }
         self._current_index = default_index
         self._initialize_from_registry()
 
@@ -1014,7 +1216,10 @@ class SelectionVariable(AbstractVariable):
 
     @value.setter
     def value(self, value: str) -> None:
-        self._current_index = self._option_list.index(value)
+        try:
+            self._current_index = self._option_index[value]
+        except KeyError:
+            raise ValueError(f"'{value}' is not a valid option") from None
 
     def is_valid(self) -> bool:
         return True
@@ -1025,9 +1230,9 @@ class SelectionVariable(AbstractVariable):
         )
 
     def _to_xml(self, node: ElementTree.Element) -> None:
-        node.append(util.create_property_node(
-            "index", self._current_index, PropertyType.Int
-        ))
+        util.add_property_node(
+            node, "index", self._current_index, PropertyType.Int
+        )
 
     def _assign_value_from(self, other: SelectionVariable) -> None:
         self._current_index = other._current_index
@@ -1035,6 +1240,8 @@ class SelectionVariable(AbstractVariable):
 
 class StringVariable(AbstractVariable):
 
+    __slots__ = ("_value",)
+
     xml_tag = "string"
 
     def __init__(
@@ -1064,9 +1271,9 @@ class StringVariable(AbstractVariable):
         self._value = util.read_property(node, "value", PropertyType.String)
 
     def _to_xml(self, node: ElementTree.Element) -> None:
-        node.append(util.create_property_node(
-            "value", self._value, PropertyType.String
-        ))
+        util.add_property_node(
+            node, "value", self._value, PropertyType.String
+        )
 
     def _assign_value_from(self, other: StringVariable) -> None:
         self._value = other.value
@@ -1074,6 +1281,11 @@ class StringVariable(AbstractVariable):
 
 class PhysicalInputVariable(AbstractVariable):
 
+    __slots__ = (
+        "_valid_types", "_valid_type_set", "_device_guid", "_input_type",
+        "_input_id"
+    )
+
     xml_tag = "physical-input"
 
     type Identifier = tuple[uuid.UUID, InputType, int]
@@ -1088,6 +1300,7 @@ class PhysicalInputVariable(AbstractVariable):
         super().__init__(name, description, is_optional)
 
         self._valid_types = valid_types
+        self._valid_type_set = frozenset(valid_types)
         self._device_guid = None
         self._input_type = valid_types[0]
         self._input_id = 1
@@ -1121,17 +1334,12 @@ class PhysicalInputVariable(AbstractVariable):
 
     def decorator(self, mode: ModeVariable) -> Callable:
         dec = self.create_decorator(mode.value)
-        match self._input_type:
-            case InputType.JoystickButton:
-                return dec.button(self._input_id)
-            case InputType.JoystickAxis:
-                return dec.axis(self._input_id)
-            case InputType.JoystickHat:
-                return dec.hat(self._input_id)
-            case _:
-                raise error.GremlinError(
-                    f"Received invalid input type '{self._input_type}'"
-                )
+        create_fn = _joystick_decorators.get(self._input_type)
+        if create_fn is None:
+            raise error.GremlinError(
+                f"Received invalid input type '{self._input_type}'"
+            )
+        return create_fn(dec, self._input_id)
 
     def create_decorator(self, mode: str):
         if not self.is_valid():
@@ -1148,18 +1356,22 @@ class PhysicalInputVariable(AbstractVariable):
     def is_valid(self) -> bool:
         return (
             self._device_guid is not None
-            and self._input_type in self._valid_types
+            and self._input_type in self._valid_type_set
             and isinstance(self._input_id, int)
         )
 
     def _from_xml(self, node: ElementTree.Element) -> None:
-        self._device_guid = util.read_property(
-            node, "device-guid", PropertyType.UUID
-        )
-        self._input_type = util.read_property(
-            node, "input-type", PropertyType.InputType
+        properties = util.read_properties_bulk(
+            node,
+            [
+                ("device-guid", PropertyType.UUID),
+                ("input-type", PropertyType.InputType),
+                ("input-id", PropertyType.Int),
+            ]
         )
-        self._input_id = util.read_property(node, "input-id", PropertyType.Int)
+        self._device_guid = properties["device-guid"]
+        self._input_type = properties["input-type"]
+        self._input_id = properties["input-id"]
 
     def _to_xml(self, node: ElementTree.Element) -> None:
         util.append_property_nodes(
@@ -1173,6 +1385,7 @@ class PhysicalInputVariable(AbstractVariable):
 
     def _assign_value_from(self, other: PhysicalInputVariable) -> None:
         self._valid_types = other._valid_types
+        self._valid_type_set = other._valid_type_set
         self._device_guid = other.device_guid
         self._input_type = other.input_type
         self._input_id = other.input_id
@@ -1187,6 +1400,11 @@ class PhysicalInputVariable(AbstractVariable):
 
 class VirtualInputVariable(AbstractVariable):
 
+    __slots__ = (
+        "_valid_types", "_valid_type_set", "_vjoy_id", "_input_type",
+        "_input_id", "_device", "_apply"
+    )
+
     xml_tag = "vjoy"
 
     def __init__(
@@ -1199,9 +1417,12 @@ class VirtualInputVariable(AbstractVariable):
         super().__init__(name, description, is_optional)
 
         self._valid_types = valid_types
+        self._valid_type_set = frozenset(valid_types)
         self._vjoy_id = 1
         self._input_type = valid_types[0]
         self._input_id = 1
+        self._device = None
+        self._apply = None
         self._initialize_from_registry()
 
     @property
@@ -1229,32 +1450,48 @@ class VirtualInputVariable(AbstractVariable):
         return self._valid_types
 
     def remap(self, value: float|bool|HatDirection) -> None:
-        device = VJoyProxy()[self._vjoy_id]
-        match self._input_type:
-            case InputType.JoystickButton:
-                device.button(self._input_id).is_pressed = value
-            case InputType.JoystickAxis:
-                device.axis(self._input_id).value = value
-            case InputType.JoystickHat:
-                device.hat(self._input_id).direction = value
-            case _:
-                raise error.GremlinError(
-                    f"Received invalid input type '{self._input_type}'"
-                )
+        # Resolve the target again if the cached vJoy device was released
+        if self._apply is None or self._device.vjoy_id is None:
+            self._rebind_apply()
+        self._apply(value)
+
+    def _rebind_apply(self) -> None:
+        """Resolves the vJoy input written to by remap."""
+        create_fn = _virtual_input_setters.get(self._input_type)
+        if create_fn is None:
+            raise error.GremlinError(
+                f"Received invalid input type '{self._input_type}'"
+            )
+        self._device = VJoyProxy()[self._vjoy_id]
+        self._apply = create_fn(self._device, self._input_id)
+
+    def _invalidate_apply(self) -> None:
+        """Forces remap to resolve the vJoy input again on its next use.
+
+        Has to be called whenever the vJoy device or input changes.
+        """
+        self._device = None
+        self._apply = None
 
     def is_valid(self) -> bool:
         return (
-            self._vjoy_id is not None
-            and self._input_type in self._valid_types
-            and isinstance(self._input_id, int)
+            isinstance(self._input_id, int)
+            and self._input_type in self._valid_type_set
         )
 
     def _from_xml(self, node: ElementTree.Element) -> None:
-        self._vjoy_id = util.read_property(node, "vjoy-id", PropertyType.Int)
-        self._input_type = util.read_property(
-            node, "input-type", PropertyType.InputType
+        properties = util.read_properties_bulk(
+            node,
+            [
+                ("vjoy-id", PropertyType.Int),
+                ("input-type", PropertyType.InputType),
+                ("input-id", PropertyType.Int),
+            ]
         )
-        self._input_id = util.read_property(node, "input-id", PropertyType.Int)
+        self._vjoy_id = properties["vjoy-id"]
+        self._input_type = properties["input-type"]
+        self._input_id = properties["input-id"]
+        self._invalidate_apply()
 
     def _to_xml(self, node: ElementTree.Element) -> None:
         util.append_property_nodes(
@@ -1268,9 +1505,40 @@ class VirtualInputVariable(AbstractVariable):
 
     def _assign_value_from(self, other: VirtualInputVariable) -> None:
         self._valid_types = other._valid_types
+        self._valid_type_set = other._valid_type_set
         self._vjoy_id = other.vjoy_id
         self._input_type = other.input_type
         self._input_id = other.input_id
+        self._invalidate_apply()
+
+
+# Maps each vJoy input type to the creation of a function setting its state
+_virtual_input_setters = {
+    InputType.JoystickAxis: lambda device, input_id: functools.partial(
+        setattr, device.axis(input_id), "value"
+    ),
+    InputType.JoystickButton: lambda device, input_id: functools.partial(
+        setattr, device.button(input_id), "is_pressed"
+    ),
+    InputType.JoystickHat: lambda device, input_id: functools.partial(
+        setattr, device.hat(input_id), "direction"
+    ),
+}
+
+
+# Maps the XML type name of a variable to the class implementing it
+_variable_types = {
+    "bool": BoolVariable,
+    "float": FloatVariable,
+    "int": IntegerVariable,
+    "keyboard": KeyboardVariable,
+    "logical-device": LogicalDeviceVariable,
+    "mode": ModeVariable,
+    "physical-input": PhysicalInputVariable,
+    "selection": SelectionVariable,
+    "string": StringVariable,
+    "vjoy": VirtualInputVariable,
+}
 
 
 def clamp_value(value: float, min_val: float, max_val: float) -> float:
@@ -1286,7 +1554,8 @@ def clamp_value(value: float, min_val: float, max_val: float) -> float:
     """
     if min_val > max_val:
         min_val, max_val = max_val, min_val
-    return min(max_val, max(min_val, value))
+    return min_val if value < min_val else \
+        max_val if value > max_val else value
 
 
 def keyboard(key_name: str, mode: str) -> Callable:
@@ -1298,16 +1567,10 @@ def keyboard(key_name: str, mode: str) -> Callable:
     """
 
     def wrap(callback):
-
-        @functools.wraps(callback)
-        def wrapper_fn(*args, **kwargs):
-            callback(*args, **kwargs)
-
         key = gremlin.keyboard.key_from_name(key_name)
         event = event_handler.Event.from_key(key)
-        callback_registry.add(wrapper_fn, event, mode)
-
-        return wrapper_fn
+        callback_registry.add(callback, event, mode)
+        return callback
 
     return wrap
 
@@ -1320,14 +1583,8 @@ def periodic(interval: float) -> Callable:
     """
 
     def wrap(callback):
-
-        @functools.wraps(callback)
-        def wrapper_fn(*args, **kwargs):
-            callback(*args, **kwargs)
-
-        periodic_registry.add(wrapper_fn, interval)
-
-        return wrapper_fn
+        periodic_registry.add(callback, interval)
+        return callback
 
     return wrap
 
@@ -1351,19 +1608,13 @@ def _input_callback(
     # the positional argument part of the decorator breaks.
 
     def wrap(callback):
-
-        @functools.wraps(callback)
-        def wrapper_fn(*args, **kwargs):
-            callback(*args, **kwargs)
-
         event = event_handler.Event(
             event_type=input_type,
             identifier=input_id,
             device_guid=device_guid,
             mode=mode
         )
-        callback_registry.add(wrapper_fn, event, mode)
-
-        return wrapper_fn
+        callback_registry.add(callback, event, mode)
+        return callback
 
     return wrap
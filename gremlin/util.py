@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
 import ctypes
+import functools
 import importlib
 import json
 import logging
@@ -275,12 +276,13 @@ def property_to_string(data_type: PropertyType, value: Any) -> str:
     Returns:
         String representation of the original data
     """
-    if data_type not in _property_to_string:
+    to_string = _property_to_string.get(data_type)
+    if to_string is None:
         raise error.GremlinError(
             f"No known conversion to string for data of type '{data_type}"
         )
 
-    return _property_to_string[data_type](value)
+    return to_string(value)
 
 
 _type_lookup = {
@@ -406,7 +408,7 @@ def create_node_from_data(
     """
     node = ElementTree.Element(node_name)
     for entry in properties:
-        node.append(create_property_node(entry[0], entry[1], entry[2]))
+        add_property_node(node, entry[0], entry[1], entry[2])
     return node
 
 
@@ -425,22 +427,62 @@ def create_property_node(
     Returns:
         A property element containing the provided name and value data.
     """
+    type_string, text = _property_node_data(name, value, property_type)
+    p_node = ElementTree.Element("property", {"type": type_string})
+    ElementTree.SubElement(p_node, "name").text = name
+    ElementTree.SubElement(p_node, "value").text = text
+    return p_node
+
+
+def add_property_node(
+        root_node: ElementTree.Element,
+        name: str,
+        value: Any,
+        property_type: PropertyType | List[PropertyType]
+) -> ElementTree.Element:
+    """Creates a <property> profile element as a child of the given node.
+
+    Args:
+        root_node: XML node to which to add the property element
+        name: content of the name element
+        value: content of the value element
+        property_type: type or list of types the property value should be of
+
+    Returns:
+        The property element added to the root node.
+    """
+    type_string, text = _property_node_data(name, value, property_type)
+    p_node = ElementTree.SubElement(root_node, "property", {"type": type_string})
+    ElementTree.SubElement(p_node, "name").text = name
+    ElementTree.SubElement(p_node, "value").text = text
+    return p_node
+
+
+def _property_node_data(
+        name: str,
+        value: Any,
+        property_type: PropertyType | List[PropertyType]
+) -> Tuple[str, str]:
+    """Returns the type attribute and value text of a <property> element.
+
+    Args:
+        name: content of the name element
+        value: content of the value element
+        property_type: type or list of types the property value should be of
+
+    Returns:
+        Tuple of the property's type string and its value as a string.
+    """
     value_type, is_valid = determine_value_type(value, property_type)
     if not is_valid:
         raise error.ProfileError(
             f"Property '{name}' has wrong type, got '{type(value)}' "
             f"for '{property_type}'."
         )
-
-    p_node = ElementTree.Element("property")
-    p_node.set("type", PropertyType.to_string(value_type))
-    n_node = ElementTree.Element("name")
-    n_node.text = name
-    v_node = ElementTree.Element("value")
-    v_node.text = property_to_string(value_type, value)
-    p_node.append(n_node)
-    p_node.append(v_node)
-    return p_node
+    return (
+        PropertyType.to_string(value_type),
+        property_to_string(value_type, value)
+    )
 
 
 def append_property_nodes(
@@ -454,7 +496,7 @@ def append_property_nodes(
         properties: data from which to create property nodes
     """
     for entry in properties:
-        root_node.append(create_property_node(entry[0], entry[1], entry[2]))
+        add_property_node(root_node, entry[0], entry[1], entry[2])
 
 def create_action_node(
         action_type: str,
@@ -628,6 +670,39 @@ def read_properties(
     return [_process_property(node, name, property_type) for node in p_nodes]
 
 
+def read_properties_bulk(
+        action_node: ElementTree.Element,
+        properties: List[Tuple[str, PropertyType | List[PropertyType]]]
+) -> Dict[str, Any]:
+    """Returns the values of several properties read in a single pass.
+
+    Args:
+        action_node: element from which to extract the property values
+        properties: pairs of property name and valid PropertyType or list of
+            valid types of the value
+
+    Returns:
+        Dictionary mapping each requested property name to its value
+    """
+    property_types = {}
+    for name, p_type in properties:
+        if isinstance(p_type, PropertyType):
+            p_type = [p_type]
+        property_types[name] = p_type
+
+    # Collect the first property node of each requested name
+    p_nodes = {}
+    for p_node in action_node.iterfind("property"):
+        name = p_node.findtext("name")
+        if name in property_types and name not in p_nodes:
+            p_nodes[name] = p_node
+
+    return {
+        name: _process_property(p_nodes.get(name), name, p_types)
+        for name, p_types in property_types.items()
+    }
+
+
 def _process_property(
         property_node: ElementTree.Element,
         name: str,
@@ -651,12 +726,13 @@ def _process_property(
         raise error.ProfileError(
             f"Value element of property '{name}' is missing"
         )
-    if "type" not in property_node.keys():
+    type_name = property_node.get("type")
+    if type_name is None:
         raise error.ProfileError(
             f"Property element is missing the 'type' attribute."
         )
 
-    p_type = PropertyType.to_enum(property_node.get("type"))
+    p_type = PropertyType.to_enum(type_name)
     if p_type not in property_types:
         raise error.ProfileError(
             f"Property type mismatch, got '{p_type}' expected one of: " +
@@ -889,12 +965,23 @@ def resource_path(relative_path: str) -> str:
     Returns:
         properly normalized resource path
     """
-    gremlin_root = Path(__file__).resolve().parent.parent
+    return str(_resource_root() / relative_path)
+
+
+@functools.cache
+def _resource_root() -> Path:
+    """Returns the directory containing Gremlin's resources.
+
+    The location does not change while Gremlin runs, so it is only
+    resolved once.
+
+    Returns:
+        Absolute path to the resource directory
+    """
     # PyInstaller creates a temp folder and stores path in _MEIPASS
     if "_MEIPASS" in sys.__dict__:
-        gremlin_root = Path(sys._MEIPASS).resolve()
-
-    return str(gremlin_root / relative_path)
+        return Path(sys._MEIPASS).resolve()
+    return Path(__file__).resolve().parent.parent
 
 
 def log(msg: str) -> None:
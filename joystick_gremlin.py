@@ -5,10 +5,12 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import ctypes
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 import time
 import traceback
@@ -74,7 +76,17 @@ def configure_logger(config: Dict[str, Any]) -> None:
     handler.setLevel(config["level"])
     formatter = logging.Formatter(config["format"], "%Y-%m-%d %H:%M:%S")
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    # Write log records to disk in a background thread, so that logging calls
+    # only enqueue the record. The listener is stopped at exit to flush
+    # pending records.
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     logger.debug("-" * 80)
     logger.debug(time.strftime("%Y-%m-%d %H:%M"))
@@ -110,108 +122,115 @@ def shutdown_cleanup() -> None:
 
     gremlin.audio_player.AudioPlayer().stop()
 
-def register_config_options() -> None:
-    cfg = gremlin.config.Configuration()
 
-    cfg.register(
+# Configuration options of the application, each entry holds the arguments
+# passed to Configuration.register
+_config_options = (
+    (
         "global", "internal", "last-mode",
         PropertyType.String, "Default",
         "Name of the last active mode", {}
-    )
-    cfg.register(
+    ),
+    (
         "global", "internal", "last-profile",
         PropertyType.String, "",
         "Most recently used profile", {}
-    )
-    cfg.register(
+    ),
+    (
         "global", "internal", "recent-profiles",
         PropertyType.List, [],
         "List of recently opened profiles", {}
-    )
-    cfg.register(
+    ),
+    (
         "global", "internal", "last-known-version",
         PropertyType.String, "0.0.0",
         "Last known version of Gremlin.", {}
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "check-for-updates",
         PropertyType.Bool, True,
         "Check for new Gremlin versions online upon start.", {}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "plugin-directory",
         PropertyType.Path, "",
         "Directory containing additional action plugins", {"is_folder": True}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "action-priorities",
         PropertyType.List, [],
         "Priority order of the actions", {}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "device-change-behavior",
         PropertyType.Selection, "Reload",
         "Action Gremlin takes when a joystick is connected or disconnected.",
         {"valid_options": ["Disable", "Ignore", "Reload"]}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "dark-mode",
         PropertyType.Bool, False,
         "Use the dark mode UI (requires restart).", {}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "refresh-axis-on-activation",
         PropertyType.Bool, True,
         "Use known physical device state to perform actions using these values "
         "upon profile activation.", {}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "refresh-axis-on-mode-change",
         PropertyType.Bool, True,
         "Force an update of all axes by emitting axis events upon a mode change.",
         {}, True
-    )
-    cfg.register(
+    ),
+    (
         "global", "general", "input-highlighting",
         PropertyType.Bool, True,
         "Select the input in the UI by using an input on the physical device. "
         "Selects only inputs if the active tab matches the device.",
         {}, True
-    )
-    cfg.register(
+    ),
+    (
         "profile", "automation", "enable-auto-loading",
         PropertyType.Bool, False,
         "Enable the automatic loading and activation of profiles based on the "
         "specified executable and profile combinations.",
         {}, True
-    )
-    cfg.register(
+    ),
+    (
         "profile", "automation", "remain-active-on-focus-loss",
         PropertyType.Bool, False,
         "Keep the profile active when the monitored executable loses focus and "
         "the newly focused executable does not have a profile assigned to it.",
         {}, True
-    )
-    cfg.register(
+    ),
+    (
         "profile", "automation", "entries-auto-loading",
         PropertyType.List, [],
         "List of executable and profile combinations for automatic loading.",
         {}, False
-    )
+    ),
+)
+
+
+def register_config_options() -> None:
+    gremlin.config.Configuration().register_many(_config_options)
 
 
 def configure_loggers() -> None:
     """Configures logging for system and user events."""
+    profile_path = gremlin.util.userprofile_path()
     configure_logger({
         "name": "system",
         "level": logging.DEBUG,
-        "logfile": os.path.join(gremlin.util.userprofile_path(), "system.log"),
+        "logfile": os.path.join(profile_path, "system.log"),
         "format": "%(asctime)s %(levelname)10s %(message)s"
     })
     configure_logger({
         "name": "user",
         "level": logging.DEBUG,
-        "logfile": os.path.join(gremlin.util.userprofile_path(), "user.log"),
+        "logfile": os.path.join(profile_path, "user.log"),
         "format": "%(asctime)s %(message)s"
     })
 
@@ -222,27 +241,23 @@ def update_action_priorities() -> None:
     priorities = []
     if cfg.exists(*key):
         priorities = cfg.value(*key)
-    priority_names = [v[0] for v in priorities]
+    priority_names = {v[0] for v in priorities}
 
     # Obtain the list of currently available plugins with an alphabetical
     # order for all but the most important actions.
     priority_actions = ["Map to vJoy", "Macro", "Response Curve"]
-    plugin_names = [
+    plugin_name_set = {
         p.name for p in
         gremlin.plugin_manager.PluginManager().repository.values()
-    ]
-    plugin_names = [n for n in priority_actions if n in plugin_names] + \
-        sorted([n for n in plugin_names if n not in priority_actions])
-
-    for tag in plugin_names:
-        if tag not in priority_names:
-            priorities.append((tag, True))
-    to_delete = []
-    for i, tag in enumerate(priority_names):
-        if tag not in plugin_names:
-            to_delete.append(i)
-    for idx in reversed(to_delete):
-        del priorities[idx]
+    }
+    plugin_names = [n for n in priority_actions if n in plugin_name_set] + \
+        sorted(plugin_name_set.difference(priority_actions))
+
+    # Remove actions that no longer exist and append newly available ones.
+    priorities = [v for v in priorities if v[0] in plugin_name_set]
+    priorities.extend(
+        (tag, True) for tag in plugin_names if tag not in priority_names
+    )
 
     cfg.set(*key, priorities)
 
@@ -325,11 +340,11 @@ class JoystickGremlinApp(QtWidgets.QApplication):
         if args.profile is not None and os.path.isfile(args.profile):
             self.backend.loadProfile(args.profile)
         else:
-            last_profile = Path(Configuration().value(
-                "global", "internal", "last-profile")
+            last_profile = self.cfg.value(
+                "global", "internal", "last-profile"
             )
-            if last_profile.is_file():
-                self.backend.loadProfile(str(last_profile))
+            if os.path.isfile(last_profile):
+                self.backend.loadProfile(last_profile)
 
         if args.enable:
             self.backend.activate_gremlin(True)
@@ -4,14 +4,18 @@
 
 from __future__ import annotations
 
+import collections
+import functools
+import operator
 from pathlib import Path
-import threading
 from typing import (
     cast,
     Any,
+    Callable,
     Generator,
 )
 
+from PySide6 import QtCore
 import pytest
 import pytestqt.qtbot
 
@@ -35,6 +39,28 @@ import joystick_gremlin
 LDIdentifier = LogicalDevice.Input.Identifier
 
 
+@functools.cache
+def _ld_identifier(input_type: InputType, input_id: int) -> LDIdentifier:
+    """Returns the shared logical device identifier of the given input.
+
+    Args:
+        input_type: The type of the input.
+        input_id: The identifier of the input.
+
+    Returns:
+        The identifier of the logical device input.
+    """
+    return LDIdentifier(input_type, input_id)
+
+
+# Maps each input type to the retrieval of the value an event carries
+_event_value_getters = {
+    InputType.JoystickAxis: operator.attrgetter("value"),
+    InputType.JoystickButton: operator.attrgetter("is_pressed"),
+    InputType.JoystickHat: operator.attrgetter("raw_value"),
+}
+
+
 class EventSpec:
 
     """Encapsulates information about an expected event and supports
@@ -91,14 +117,8 @@ class EventSpec:
             return False
         if self.input_id != event.identifier:
             return False
-        match self.event_type:
-            case InputType.JoystickAxis:
-                return self.expected_value == event.value
-            case InputType.JoystickButton:
-                return self.expected_value == event.is_pressed
-            case InputType.JoystickHat:
-                return self.expected_value == event.raw_value
-        return False
+        getter = _event_value_getters.get(self.event_type)
+        return getter is not None and self.expected_value == getter(event)
 
     def __ne__(self, event: Any) -> bool:
         return not (event == self)
@@ -115,13 +135,23 @@ class EventLogger:
             qtbot: The QtBot instance used for timing and event processing.
         """
         self._qtbot = qtbot
-        self.logged_events: list[event_handler.Event] = []
-        self.emitted_events: list[event_handler.Event] = []
+        self.logged_events: collections.deque[event_handler.Event] = \
+            collections.deque()
+        # Events compare and hash by their input, so this counts the pending
+        # self-emitted events per input.
+        self.emitted_events: collections.Counter[event_handler.Event] = \
+            collections.Counter()
 
         event_handler.EventListener().joystick_event.connect(
             self._process_event
         )
 
+    def close(self) -> None:
+        """Stops receiving events from Gremlin."""
+        event_handler.EventListener().joystick_event.disconnect(
+            self._process_event
+        )
+
     def clear(self) -> None:
         """Clears all logged events."""
         self.logged_events.clear()
@@ -144,7 +174,7 @@ class EventLogger:
                 timeout=500,
                 raising=True
             ).wait()
-        return self.logged_events.pop(0)
+        return self.logged_events.popleft()
 
     def _process_event(self, event: event_handler.Event) -> None:
         """Record all events we receive unless they were actively emitted.
@@ -153,10 +183,9 @@ class EventLogger:
             event: The event to process.
         """
         # If the event is one that we've emitted ourselves, ignore it.
-        for evt in self.emitted_events:
-            if evt == event:
-                self.emitted_events.remove(evt)
-                return
+        if self.emitted_events[event] > 0:
+            self.emitted_events[event] -= 1
+            return
         self.logged_events.append(event)
 
 
@@ -207,6 +236,10 @@ class JoystickGremlinBot:
         self._event_listener.terminate()
         joystick_gremlin.shutdown_cleanup()
 
+    def close(self) -> None:
+        """Releases the connections the bot holds to Gremlin."""
+        self._event_logger.close()
+
     def wait(self, duration: float) -> None:
         """Blocking wait for the specified duration while processing events in
         the background.
@@ -216,6 +249,23 @@ class JoystickGremlinBot:
         """
         self._qtbot.wait(int(duration * 1000))
 
+    def wait_until(
+        self,
+        predicate: Callable[[], bool],
+        timeout: float = 1.0
+    ) -> None:
+        """Blocking wait until the predicate holds while processing events in
+        the background.
+
+        If the predicate does not hold within the timeout, a TimeoutError
+        exception is raised.
+
+        Args:
+            predicate: Callable returning True once the wait should end.
+            timeout: The maximum duration in seconds to wait.
+        """
+        self._qtbot.waitUntil(predicate, timeout=int(timeout * 1000))
+
     def next_event(self) -> event_handler.Event:
         """Waits for and retrieves the next logged event.
 
@@ -259,7 +309,7 @@ class JoystickGremlinBot:
         """
         input = cast(
             LogicalDevice.Axis,
-            self._logical_device[LDIdentifier(InputType.JoystickAxis, input_id)]
+            self._logical_device[_ld_identifier(InputType.JoystickAxis, input_id)]
         )
         return input.value
 
@@ -274,7 +324,7 @@ class JoystickGremlinBot:
         """
         input = cast(
             LogicalDevice.Button,
-            self._logical_device[LDIdentifier(InputType.JoystickButton, input_id)]
+            self._logical_device[_ld_identifier(InputType.JoystickButton, input_id)]
         )
         return input.is_pressed
 
@@ -289,7 +339,7 @@ class JoystickGremlinBot:
         """
         input = cast(
             LogicalDevice.Hat,
-            self._logical_device[LDIdentifier(InputType.JoystickHat, input_id)]
+            self._logical_device[_ld_identifier(InputType.JoystickHat, input_id)]
         )
         return input.direction
 
@@ -322,16 +372,18 @@ class JoystickGremlinBot:
         """Holds a button pressed for the specified duration.
 
         This returns immediately after pressing the button. The release event
-        is emitted after the specified delay in the background while other
-        interactions with Gremlin can happen.
+        is emitted by the Qt event loop after the specified delay, i.e. while
+        the test waits for time to pass or events to arrive, and other
+        interactions with Gremlin can happen in the meantime.
 
         Args:
             button_id: The identifier of the button input.
             duration: The duration in seconds to hold the button pressed.
         """
         self.press_button(button_id)
-        threading.Timer(
-            duration, lambda: self.release_button(button_id)).start()
+        QtCore.QTimer.singleShot(
+            int(duration * 1000), lambda: self.release_button(button_id)
+        )
 
     def tap_button(self, button_id: int) -> None:
         """Taps a button (press and release) quickly.
@@ -367,7 +419,7 @@ class JoystickGremlinBot:
         """
         input = cast(
             LogicalDevice.Axis,
-            self._logical_device[LDIdentifier(InputType.JoystickAxis, axis_id)]
+            self._logical_device[_ld_identifier(InputType.JoystickAxis, axis_id)]
         )
         new_value = clamp(input.value + delta, -1.0, 1.0)
         self._emit_event(InputType.JoystickAxis, axis_id, new_value)
@@ -410,7 +462,7 @@ class JoystickGremlinBot:
             value: The value associated with the event.
         """
         # Update the state of the logical device.
-        self._logical_device[LDIdentifier(input_type, input_id)].update(value)
+        self._logical_device[_ld_identifier(input_type, input_id)].update(value)
 
         # Prepare event parameters to keep type checkers happy.
         is_pressed = None
@@ -436,7 +488,7 @@ class JoystickGremlinBot:
 
         # Inform the event logger about the event we're about to emit, then
         # emit the event.
-        self._event_logger.emitted_events.append(evt)
+        self._event_logger.emitted_events[evt] += 1
         self._event_listener.joystick_event.emit(evt)
 
 
@@ -449,6 +501,7 @@ def jgbot(qtbot: pytestqt.qtbot.QtBot) -> Generator[JoystickGremlinBot]:
     gremlin.ui.backend.Backend().minimize()
     yield bot
     bot.stop()
+    bot.close()
 
 
 @pytest.fixture
@@ -41,8 +41,7 @@ def test_button_advanced(jgbot: JoystickGremlinBot, profile_dir: Path) -> None:
     assert jgbot.button(OUT_BUTTON_1) == True
     jgbot.wait(0.4)
     assert jgbot.button(OUT_BUTTON_1) == True
-    jgbot.wait(0.2)
-    assert jgbot.button(OUT_BUTTON_1) == False
+    jgbot.wait_until(lambda: jgbot.button(OUT_BUTTON_1) == False)
 
 
 def test_remap_inverse(jgbot: JoystickGremlinBot, profile_dir: Path) -> None:
@@ -114,6 +114,20 @@ def test_load_save(cfg: gremlin.config.Configuration) -> None:
     assert cfg.expose("test", "case", "4") == False
 
 
+def test_register_many(cfg: gremlin.config.Configuration) -> None:
+    with mock.patch.object(cfg, cfg.save.__name__) as save:
+        cfg.register_many([
+            ("test", "case", "1", PropertyType.Int, 42, "one", {"min": 1, "max": 50}),
+            ("test", "case", "2", PropertyType.Bool, False, "two", {}, True),
+        ])
+    save.assert_called_once()
+
+    assert cfg.value("test", "case", "1") == 42
+    assert cfg.expose("test", "case", "1") == False
+    assert cfg.value("test", "case", "2") == False
+    assert cfg.expose("test", "case", "2") == True
+
+
 def test_exceptions(cfg: gremlin.config.Configuration) -> None:
     cfg.register(
         "test", "case", "1", PropertyType.Int, 42, "", {"min": 1, "max": 20}
@@ -82,6 +82,20 @@ class TestModeHierarchy:
         assert set(mh.mode_names()) == set(["Zeta", "Second", "Third"])
         assert mh.first_mode == "Zeta"
 
+    def test_mode_name_set(self) -> None:
+        p = Profile()
+        mh = ModeHierarchy(p)
+        assert mh.mode_name_set() == frozenset(["Default"])
+
+        mh.add_mode("Second")
+        assert mh.mode_name_set() == frozenset(["Default", "Second"])
+
+        mh.rename_mode("Second", "Third")
+        assert mh.mode_name_set() == frozenset(["Default", "Third"])
+
+        mh.delete_mode("Third")
+        assert mh.mode_name_set() == frozenset(["Default"])
+
     def test_parent(self) -> None:
         p = Profile()
         mh = ModeHierarchy(p)
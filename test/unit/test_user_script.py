@@ -2,11 +2,19 @@
 
 # SPDX-License-Identifier: GPL-3.0-only
 
+import functools
+import gc
 import pathlib
 import pytest
+import threading
+import time
 import uuid
+import weakref
 
-from gremlin import profile, shared_state, types, user_script
+import dill
+
+from gremlin import event_handler, profile, shared_state, types, user_script
+from gremlin.ui.script import VirtualInputVariableModel
 from test.unit.conftest import get_fake_device_guid
 
 
@@ -216,6 +224,13 @@ class TestScript:
             assert var.value == "selection2"
             assert var.is_valid()
 
+        with subtests.test("duplicate options use first occurrence"):
+            dup = user_script.SelectionVariable(
+                "duplicates", "", True, ["a", "b", "a"]
+            )
+            dup.value = "a"
+            assert dup._current_index == 0
+
     @pytest.mark.parametrize("value", ["selection1", "selection2", "selection3"])
     def test_selection_variable_xml_transforms(
         self, script_for_test: user_script.Script, value
@@ -272,6 +287,14 @@ class TestScript:
             )
             var_from_xml.from_xml(var.to_xml())
 
+        with subtests.test("remap target reset on change"):
+            var_from_xml._apply = lambda value: None
+            var_from_xml.from_xml(var.to_xml())
+            assert var_from_xml._apply is None
+            var_from_xml._apply = lambda value: None
+            var_from_xml._assign_value_from(var)
+            assert var_from_xml._apply is None
+
     def test_physical_input_variable(
         self, script_for_test: user_script.Script, subtests
     ):
@@ -361,3 +384,278 @@ class TestScript:
         new_device_uuid = uuid.uuid4()
         assert script_for_test.swap_uuid(existing_device_uuid, new_device_uuid)
         assert var.value[0] == new_device_uuid
+
+    def test_variables_use_slots(self, script_for_test: user_script.Script):
+        for var in script_for_test.variables.values():
+            assert not hasattr(var, "__dict__")
+            clone = var.clone()
+            assert type(clone) is type(var)
+            assert clone.name == var.name
+            assert clone.value == var.value
+
+
+def test_parameter_names_do_not_keep_callbacks_alive():
+    def callback(event, vjoy):
+        pass
+
+    assert user_script._parameter_names(callback) == {"event", "vjoy"}
+    callback_ref = weakref.ref(callback)
+    del callback
+    gc.collect()
+    assert callback_ref() is None
+
+
+def test_definition_cache_holds_script_defaults(tmp_path: pathlib.Path):
+    path = tmp_path / "cached_definitions.py"
+    path.write_text(
+        "from gremlin import user_script\n"
+        "flag = user_script.BoolVariable('flag', '', True, False)\n"
+    )
+    user_script._definition_cache.pop(path, None)
+
+    first = user_script.Script(path)
+    first.get_variable("flag").value = True
+    assert user_script.Script(path).get_variable("flag").value is False
+
+    # Executing the module for a script with registered values must not
+    # leak those values to other instances through the cache.
+    user_script._definition_cache.pop(path, None)
+    same_id = user_script.Script()
+    same_id.from_xml(first.to_xml())
+    assert same_id.get_variable("flag").value is True
+    assert user_script.Script(path).get_variable("flag").value is False
+
+    # Cache hits apply the values registered for the loading script.
+    reloaded = user_script.Script()
+    reloaded._id = first.id
+    reloaded.path = path
+    reloaded._retrieve_variable_definitions()
+    assert reloaded.get_variable("flag").value is True
+
+
+def test_periodic_registrations_are_kept_separately():
+    registry = user_script.PeriodicRegistry()
+
+    def callback():
+        pass
+
+    registry.add(callback, 0.1)
+    registry.add(callback, 0.5)
+    assert sorted(interval for interval, _ in registry._registry) == [0.1, 0.5]
+    registry.clear()
+    assert registry._registry == []
+
+
+def test_callback_registry_accepts_unnamed_callables():
+    registry = user_script.CallbackRegistry()
+    event = event_handler.Event(
+        event_type=types.InputType.JoystickButton,
+        identifier=1,
+        device_guid=uuid.uuid4(),
+        mode="Default"
+    )
+    callback = functools.partial(print, "pressed")
+    registry.add(callback, event, "Default")
+    assert list(registry.registry[event.device_guid]["Default"][event].values()) \
+        == [callback]
+
+
+def test_joystick_decorator_invalid_guid_is_uuid():
+    decorator = user_script.JoystickDecorator("Stick", "not-a-guid", "Default")
+    assert isinstance(decorator.device_guid, uuid.UUID)
+    assert decorator.device_guid == dill.UUID_Invalid
+
+
+class _StubPlugin:
+
+    """Plugin binding a marker object to callbacks with a stub parameter."""
+
+    def __init__(self):
+        self.keyword = "stub"
+        self.marker = object()
+
+    def install(self, callback, partial_fn):
+        return partial_fn(callback, stub=self.marker)
+
+
+@pytest.fixture
+def periodic_registry():
+    registry = user_script.PeriodicRegistry()
+    registry._plugins = [_StubPlugin()]
+    yield registry
+    registry.stop()
+    registry.clear()
+
+
+class TestPeriodicRegistry:
+
+    def test_shared_and_distinct_intervals_fire(
+        self, periodic_registry: user_script.PeriodicRegistry
+    ):
+        fired = {name: threading.Event() for name in ("a", "b", "c")}
+        markers = []
+
+        def callback_b(stub):
+            markers.append(stub)
+            fired["b"].set()
+
+        periodic_registry.add(lambda: fired["a"].set(), 0.01)
+        periodic_registry.add(callback_b, 0.01)
+        periodic_registry.add(lambda: fired["c"].set(), 0.02)
+        periodic_registry.start()
+
+        for event in fired.values():
+            assert event.wait(2.0)
+        assert markers[0] is periodic_registry._plugins[0].marker
+
+    def test_callback_fires_at_each_interval(
+        self, periodic_registry: user_script.PeriodicRegistry
+    ):
+        calls = []
+        fired = threading.Event()
+
+        def callback():
+            calls.append(time.monotonic())
+            if len(calls) >= 3:
+                fired.set()
+
+        periodic_registry.add(callback, 0.01)
+        periodic_registry.add(callback, 0.05)
+        periodic_registry.start()
+
+        assert fired.wait(2.0)
+        scheduled = sorted(
+            (interval, callbacks) for _, interval, callbacks
+            in periodic_registry._queue
+        )
+        assert scheduled == [(0.01, (callback,)), (0.05, (callback,))]
+
+    def test_stop_returns_promptly(
+        self, periodic_registry: user_script.PeriodicRegistry
+    ):
+        periodic_registry.add(lambda: None, 60.0)
+        periodic_registry.start()
+        assert periodic_registry._thread.is_alive()
+
+        start = time.monotonic()
+        periodic_registry.stop()
+        assert time.monotonic() - start < 0.5
+        assert not periodic_registry._thread.is_alive()
+
+    def test_empty_registry_starts_and_stops(
+        self, periodic_registry: user_script.PeriodicRegistry
+    ):
+        periodic_registry.start()
+        assert not periodic_registry._thread.is_alive()
+        periodic_registry.stop()
+        assert not periodic_registry._thread.is_alive()
+
+    def test_restart_after_clear(
+        self, periodic_registry: user_script.PeriodicRegistry
+    ):
+        first = threading.Event()
+        second = threading.Event()
+        plugins = periodic_registry._plugins
+
+        periodic_registry.add(first.set, 0.01)
+        periodic_registry.start()
+        assert first.wait(2.0)
+        periodic_registry.stop()
+        periodic_registry.clear()
+
+        first.clear()
+        periodic_registry.add(second.set, 0.01)
+        periodic_registry.start()
+        assert second.wait(2.0)
+        periodic_registry.stop()
+        assert not first.is_set()
+        assert periodic_registry._plugins is plugins
+
+
+class _StubVJoyInput:
+
+    """Input of a stub vJoy device recording the state written to it."""
+
+
+class _StubVJoyDevice:
+
+    """vJoy device stub creating its inputs on first access."""
+
+    def __init__(self, vjoy_id: int):
+        self.vjoy_id = vjoy_id
+        self.inputs = {}
+
+    def axis(self, input_id: int) -> _StubVJoyInput:
+        return self.inputs.setdefault(("axis", input_id), _StubVJoyInput())
+
+    def button(self, input_id: int) -> _StubVJoyInput:
+        return self.inputs.setdefault(("button", input_id), _StubVJoyInput())
+
+    def hat(self, input_id: int) -> _StubVJoyInput:
+        return self.inputs.setdefault(("hat", input_id), _StubVJoyInput())
+
+    def invalidate(self) -> None:
+        self.vjoy_id = None
+
+
+class _StubVJoyProxy:
+
+    """VJoyProxy stub handing out stub devices."""
+
+    vjoy_devices = {}
+
+    def __getitem__(self, index: int) -> _StubVJoyDevice:
+        return _StubVJoyProxy.vjoy_devices.setdefault(
+            index, _StubVJoyDevice(index)
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        for device in _StubVJoyProxy.vjoy_devices.values():
+            device.invalidate()
+        _StubVJoyProxy.vjoy_devices = {}
+
+
+def test_virtual_input_remap_resolves_target(monkeypatch, subtests):
+    monkeypatch.setattr(user_script, "VJoyProxy", _StubVJoyProxy)
+    monkeypatch.setattr(_StubVJoyProxy, "vjoy_devices", {})
+    var = user_script.VirtualInputVariable(
+        "", "", True,
+        [types.InputType.JoystickButton, types.InputType.JoystickAxis]
+    )
+
+    with subtests.test("rebind after vJoy reset"):
+        var.remap(True)
+        old_device = _StubVJoyProxy.vjoy_devices[1]
+        assert old_device.inputs[("button", 1)].is_pressed is True
+
+        _StubVJoyProxy.reset()
+        var.remap(False)
+        new_device = _StubVJoyProxy.vjoy_devices[1]
+        assert new_device is not old_device
+        assert new_device.inputs[("button", 1)].is_pressed is False
+        assert old_device.inputs[("button", 1)].is_pressed is True
+
+    model = VirtualInputVariableModel(var)
+
+    with subtests.test("rebind after input id change"):
+        model.inputId = 2
+        var.remap(True)
+        inputs = _StubVJoyProxy.vjoy_devices[1].inputs
+        assert inputs[("button", 2)].is_pressed is True
+        assert inputs[("button", 1)].is_pressed is False
+
+    with subtests.test("rebind after vJoy id change"):
+        model.vjoyId = 2
+        var.remap(False)
+        assert _StubVJoyProxy.vjoy_devices[2].inputs[("button", 2)] \
+            .is_pressed is False
+        assert _StubVJoyProxy.vjoy_devices[1].inputs[("button", 2)] \
+            .is_pressed is True
+
+    with subtests.test("rebind after input type change"):
+        model.inputType = types.InputType.to_string(
+            types.InputType.JoystickAxis
+        )
+        var.remap(0.5)
+        assert _StubVJoyProxy.vjoy_devices[2].inputs[("axis", 2)].value == 0.5
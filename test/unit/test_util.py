@@ -141,6 +141,58 @@ def test_read_property():
         )
 
 
+def test_read_properties_bulk():
+    doc = ElementTree.fromstring(xml_doc)
+
+    properties = gremlin.util.read_properties_bulk(
+        doc,
+        [
+            ("description", gremlin.types.PropertyType.String),
+            ("pi", [
+                gremlin.types.PropertyType.Float,
+                gremlin.types.PropertyType.Int
+            ]),
+            ("lies", gremlin.types.PropertyType.Bool),
+        ]
+    )
+    assert properties == {
+        "description": "This is a test",
+        "pi": 3.14,
+        "lies": True,
+    }
+
+    with pytest.raises(gremlin.error.ProfileError, match=r"A property named"):
+        gremlin.util.read_properties_bulk(
+            doc, [("does not exist", gremlin.types.PropertyType.Bool)]
+        )
+    with pytest.raises(gremlin.error.ProfileError, match=r"Property type mismatch"):
+        gremlin.util.read_properties_bulk(
+            doc, [("lies", gremlin.types.PropertyType.Float)]
+        )
+
+
+def test_add_property_node():
+    root = ElementTree.Element("action")
+    node = gremlin.util.add_property_node(
+        root, "pi", 3.14, gremlin.types.PropertyType.Float
+    )
+    assert list(root) == [node]
+    assert ElementTree.tostring(node) == ElementTree.tostring(
+        gremlin.util.create_property_node(
+            "pi", 3.14, gremlin.types.PropertyType.Float
+        )
+    )
+    assert gremlin.util.read_property(
+        root, "pi", gremlin.types.PropertyType.Float
+    ) == 3.14
+
+    with pytest.raises(gremlin.error.ProfileError, match=r"has wrong type"):
+        gremlin.util.add_property_node(
+            root, "lies", 3.14, gremlin.types.PropertyType.Bool
+        )
+    assert len(root) == 1
+
+
 @pytest.mark.parametrize(
     "value, min_val, max_val, expected", [
         pytest.param(5, 0, 10, 5, id="within_range"),
@@ -255,9 +255,9 @@ class Axis:
 
         # Normalize value to [-1, 1] and apply response curve and deadzone
         # settings
-        self._value = self._response_curve_fn(
-            self._deadzone_fn(min(1.0, max(-1.0, value)))
-        )
+        self._value = self._response_curve_fn(self._deadzone_fn(
+            -1.0 if value < -1.0 else 1.0 if value > 1.0 else value
+        ))
 
         if not VJoyInterface.SetAxis(
                 # Built-in rounding is "bankers rounding" which we don't want.
@@ -985,7 +985,11 @@ def deadzone(
     Returns:
         Value clamped and interpolated based on the deadzone settings
     """
+    # Clamp with comparisons rather than min / max calls, as this runs for
+    # every axis value written
     if value >= 0:
-        return min(1.0, max(0.0, (value - high_center) / abs(high - high_center)))
+        value = (value - high_center) / abs(high - high_center)
+        return 0.0 if value < 0.0 else 1.0 if value > 1.0 else value
     else:
-        return max(-1.0, min(0.0, (value - low_center) / abs(low - low_center)))
+        value = (value - low_center) / abs(low - low_center)
+        return -1.0 if value < -1.0 else 0.0 if value > 0.0 else value